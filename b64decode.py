@@ -1,8 +1,26 @@
 #!/usr/bin/env python3
 
-import base64
 import os
 import sys
+from collections import deque
+from functools import partial
+from itertools import islice
+from multiprocessing import Pool
+
+# pybase64 wraps libbase64's SIMD codecs and mirrors the stdlib API;
+# fall back to the stdlib module when it is not installed.
+try:
+    import pybase64 as base64
+except ImportError:
+    import base64
+
+# --- Configuration ---
+# Number of CPU cores to use for parallel decoding.
+NUM_PROCESSES = os.cpu_count() or 4
+# Number of input lines handed to a worker per task.
+CHUNK_SIZE = 4096
+# Number of console lines buffered before they are written out.
+PRINT_BATCH = 1024
 
 def base64_decode_safe(line):
     """
@@ -11,16 +29,19 @@ def base64_decode_safe(line):
     cleaned_line = line.strip()
 
     # 1. Try standard Base64
-    try:
-        return base64.b64decode(cleaned_line, validate=True)
-    except Exception:
-        pass
+    # Lines containing '-' or '_' can never pass strict standard decoding,
+    # so skip the raise-and-catch and go straight to the URL-safe decoder.
+    if '-' not in cleaned_line and '_' not in cleaned_line:
+        try:
+            return base64.b64decode(cleaned_line, validate=True)
+        except Exception:
+            pass
 
     # 2. Try Base64 URL-safe (handles '-' and '_')
     try:
         # base64.urlsafe_b64decode requires padding ('=')
-        padding_needed = 4 - (len(cleaned_line) % 4)
-        if padding_needed != 4:
+        padding_needed = -len(cleaned_line) & 3
+        if padding_needed:
             cleaned_line += '=' * padding_needed
         return base64.urlsafe_b64decode(cleaned_line)
     except Exception:
@@ -45,8 +66,6 @@ def format_output(decoded_bytes, format_choice, split_length=0):
         return decoded_bytes.hex()
     
     elif format_choice == '3': # Hex with Custom Split
-        hex_str = decoded_bytes.hex()
-        
         # Default split logic for common hash lengths if user enters 0
         if split_length == 0:
             if length == 32: # 32 bytes = 64 hex chars (e.g., SHA-256)
@@ -54,45 +73,124 @@ def format_output(decoded_bytes, format_choice, split_length=0):
             elif length % 16 == 0 and length > 0: # Split every 16 bytes (32 hex chars)
                 split_length = 32
             else:
-                return hex_str # If custom length, do not split
-        
-        # Split length in Hex characters
-        split_hex_len = split_length * 2
-        
-        parts = []
-        for i in range(0, len(hex_str), split_hex_len):
-            parts.append(hex_str[i:i + split_hex_len])
+                return decoded_bytes.hex() # If custom length, do not split
         
-        return ':'.join(parts)
+        # A negative bytes_per_sep groups from the left, like the old slicing loop
+        return decoded_bytes.hex(':', -split_length)
 
     return f"Raw Bytes ({length}B): {decoded_bytes.hex()}"
 
+def make_formatter(format_choice, split_length=0):
+    """
+    Builds the formatter for the chosen format once, so the per-line path is a
+    single call. A fixed split length maps straight onto bytes.hex; everything
+    else falls back to format_output. The result is picklable for the workers.
+    """
+    if format_choice == '2':
+        return bytes.hex
+    if format_choice == '3' and split_length > 0:
+        return partial(bytes.hex, sep=':', bytes_per_sep=-split_length)
+    return partial(format_output, format_choice=format_choice, split_length=split_length)
+
+
+def _decode_one(line, formatter):
+    """
+    Decodes and formats a single line.
+    Returns None if decoding failed, otherwise (decoded_length, formatted_result).
+    """
+    decoded_bytes = base64_decode_safe(line)
+    if decoded_bytes is None:
+        return None
+    if len(decoded_bytes) == 0:
+        return 0, None
+    return len(decoded_bytes), formatter(decoded_bytes)
+
+def _decode_chunk(args):
+    """
+    Worker entry point: decodes a chunk of (index, line) pairs.
+    """
+    chunk, formatter = args
+    return [(idx, _decode_one(line, formatter)) for idx, line in chunk]
+
+def _iter_chunks(lines, formatter):
+    """
+    Groups non-empty lines into chunks of CHUNK_SIZE, keeping their original line numbers.
+    """
+    numbered = ((idx, line) for idx, line in enumerate(lines, 1) if line.strip())
+    while True:
+        chunk = list(islice(numbered, CHUNK_SIZE))
+        if not chunk:
+            return
+        yield chunk, formatter
+
+def _imap_bounded(pool, func, iterable, window):
+    """
+    Ordered equivalent of Pool.imap that keeps at most 'window' tasks in flight,
+    so a large input is streamed instead of being queued up all at once.
+    """
+    pending = deque()
+    for item in iterable:
+        pending.append(pool.apply_async(func, (item,)))
+        if len(pending) >= window:
+            yield pending.popleft().get()
+    while pending:
+        yield pending.popleft().get()
 
-def process_lines(lines, format_choice, split_length):
+def process_lines(lines, formatter, output_path=None):
     """
-    Processes a list of lines and returns a list of formatted results.
+    Processes an iterable of lines in parallel, printing each result in input
+    order and writing it to the optional 'output_path' file as it is decoded.
+    Returns (decoded_count, save_error), where save_error is the exception
+    raised when opening the output file failed, or None.
     """
-    results = []
+    decoded_count = 0
+    # Opened on the first decoded entry, so a run that decodes nothing
+    # leaves no output file behind
+    out = None
+    save_error = None
+    # Console messages are collected and written in batches of PRINT_BATCH
+    # lines instead of one print() call per line
+    stdout_write = sys.stdout.write
+    out_buf = []
     
-    for idx, line in enumerate(lines, 1):
-        if not line.strip():
-            continue
-            
-        decoded_bytes = base64_decode_safe(line)
-        
-        if decoded_bytes is not None:
-            # Skip if 0 bytes decoded
-            if len(decoded_bytes) == 0:
-                 print(f"[{idx}] Warning: Empty line or 0 bytes decoded.")
-                 continue
-
-            formatted_result = format_output(decoded_bytes, format_choice, split_length)
-            print(f"[{idx}] Success: {len(decoded_bytes)}B -> {formatted_result}")
-            results.append(formatted_result)
-        else:
-            print(f"[{idx}] Error: Failed to decode Base64.")
+    try:
+        with Pool(NUM_PROCESSES) as pool:
+            chunks = _iter_chunks(lines, formatter)
+            for results in _imap_bounded(pool, _decode_chunk, chunks, NUM_PROCESSES * 2):
+                for idx, result in results:
+                    if result is None:
+                        out_buf.append(f"[{idx}] Error: Failed to decode Base64.")
+                    elif result[0] == 0:
+                        # Skip if 0 bytes decoded
+                        out_buf.append(f"[{idx}] Warning: Empty line or 0 bytes decoded.")
+                    else:
+                        decoded_length, formatted_result = result
+                        out_buf.append(f"[{idx}] Success: {decoded_length}B -> {formatted_result}")
+                        if output_path and save_error is None:
+                            if out is None:
+                                try:
+                                    out = open(output_path, 'w')
+                                except OSError as e:
+                                    # Keep decoding to the console; main reports the error
+                                    save_error = e
+                            if out is not None:
+                                out.write(formatted_result + '\n')
+                        decoded_count += 1
+
+                    if len(out_buf) >= PRINT_BATCH:
+                        out_buf.append('')
+                        stdout_write('\n'.join(out_buf))
+                        out_buf.clear()
+    finally:
+        if out is not None:
+            out.close()
+        # Print whatever is still buffered, even if decoding was interrupted
+        if out_buf:
+            out_buf.append('')
+            stdout_write('\n'.join(out_buf))
+        sys.stdout.flush()
             
-    return results
+    return decoded_count, save_error
 
 def main():
     """
@@ -112,9 +210,11 @@ def main():
             print("Error: File does not exist. Exiting.")
             return
         
-        with open(file_path, 'r') as f:
-            lines = f.read().splitlines()
-        print(f"Read {len(lines)} lines from file.")
+        # The file is streamed line by line during decoding, never read whole
+        if os.path.getsize(file_path) == 0:
+            print("Warning: No data to process.")
+            return
+        lines = None
         
     elif mode == '2':
         print("\nEnter Base64 data. End with an empty line and press Enter twice.")
@@ -126,13 +226,13 @@ def main():
             lines.append(line)
         print(f"Read {len(lines)} entries.")
         
+        if not lines:
+            print("Warning: No data to process.")
+            return
+        
     else:
         print("Error: Invalid mode selection. Exiting.")
         return
-        
-    if not lines:
-        print("Warning: No data to process.")
-        return
 
     # --- Output Format Selection ---
     print("\n--- Output Format Selection ---")
@@ -146,29 +246,49 @@ def main():
         try:
             split_length_input = input("Enter segment length in bytes (e.g., 16, 32). Enter 0 for default split: ").strip()
             split_length = int(split_length_input)
+            if split_length < 0:
+                raise ValueError(split_length)
         except ValueError:
             print("Warning: Invalid value, using default split.")
             split_length = 0
             
+    formatter = make_formatter(format_choice, split_length)
+            
+    # --- Save to File ---
+    # Results are written out as they are decoded, so ask for the destination first
+    output_path = None
+    save = input("\nSave results to file? (y/n): ").strip().lower()
+    if save == 'y':
+        output_path = input("Enter output file path: ").strip()
+
     print("\n--- Decoding Results ---")
-    results = process_lines(lines, format_choice, split_length)
+    try:
+        if lines is None:
+            with open(file_path, 'r') as f:
+                decoded_count, save_error = process_lines((line.rstrip('\n') for line in f), formatter, output_path)
+        else:
+            decoded_count, save_error = process_lines(lines, formatter, output_path)
+    except Exception as e:
+        print(f"Error processing input: {e}")
+        return
 
-    # --- Save to File ---
-    if not results:
+    if not decoded_count:
         print("\nWarning: No valid data decoded.")
         return
 
-    save = input("\nSave results to file? (y/n): ").strip().lower()
-    if save == 'y':
-        output_path = input("Enter output file path: ").strip()
-        try:
-            with open(output_path, 'w') as out:
-                out.write('\n'.join(results) + '\n')
-            print(f"Success: Output saved to {output_path}")
-        except Exception as e:
-            print(f"Error saving file: {e}")
+    if save_error is not None:
+        print(f"Error saving file: {save_error}")
+    elif output_path:
+        print(f"Success: Output saved to {output_path}")
     else:
         print("\nFinished.")
 
 if __name__ == "__main__":
+    if sys.platform.startswith('win') or sys.platform == 'darwin':
+        try:
+            from multiprocessing import freeze_support
+            freeze_support()
+        except ImportError:
+            pass
+            
     main()
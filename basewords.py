@@ -1,7 +1,9 @@
 import re
+import mmap
 from collections import Counter
 import os
 import sys
+from operator import itemgetter
 from multiprocessing import Pool, Manager
 
 # --- Configuration ---
@@ -9,85 +11,99 @@ from multiprocessing import Pool, Manager
 NUM_PROCESSES = os.cpu_count() or 4 
 # Minimum acceptable length for a base word. Set to 2 to exclude single letters.
 MIN_WORD_LENGTH = 2 
+# Approximate size of the byte span a worker reads and scans at a time, so
+# the working set stays the same whatever the input size.
+CHUNK_SIZE = 1 << 23
+# Runs of at least MIN_WORD_LENGTH letters (Unicode-aware, excluding digits
+# and underscores); the length filter runs inside the regex engine.
+# Compiled once at import so every worker reuses it across chunks.
+WORD_PATTERN = re.compile(r'[^\W\d_]{%d,}' % MIN_WORD_LENGTH)
 
-def process_chunk_for_words(chunk):
+def process_chunk_for_words(span):
     """
-    Processes a list of lines (a chunk) and returns a Counter 
-    of the base words found in that chunk. Includes a minimum word length filter.
+    Reads one (file_path, start, end) byte span of the file and returns a
+    Counter of the base words found in it. Includes a minimum word length filter.
     """
-    local_counter = Counter()
-    word_pattern = re.compile(r'[^\W\d_]+')
+    file_path, start, end = span
+    with open(file_path, 'rb') as f:
+        f.seek(start)
+        chunk = f.read(end - start)
     
-    for line in chunk:
-        line = line.lower()
-        base_words = word_pattern.findall(line)
-        
-        # Filtering Step: Only include words that meet the minimum length requirement
-        filtered_words = [word for word in base_words if len(word) >= MIN_WORD_LENGTH]
-        
-        local_counter.update(filtered_words)
+    # Decode the whole chunk at once; words never span lines, so scanning
+    # the chunk in one call matches scanning it line by line.
+    text = chunk.decode('utf-8', errors='replace')
+    
+    # WORD_PATTERN already enforces the minimum word length. Count the raw
+    # tokens first, then lowercase only the distinct ones and fold them.
+    raw_counter = Counter(WORD_PATTERN.findall(text))
+    
+    local_counter = Counter()
+    local_get = local_counter.get
+    for word, count in raw_counter.items():
+        word = word.lower()
+        local_counter[word] = local_get(word, 0) + count
         
     return local_counter
 
 def file_to_chunks(file_path):
     """
-    Reads a file line by line and divides its content into chunks 
-    for parallel processing. Handles large files by streaming.
+    Memory-maps a file and yields newline-aligned (file_path, start, end)
+    byte spans for parallel processing. Only offsets are handed to the
+    workers, which read and decode their own span.
     """
     try:
         total_size = os.path.getsize(file_path)
     except OSError:
         print(f"Error: Could not determine size of file '{file_path}'.", file=sys.stderr)
-        return []
-        
-    chunk_size_bytes = max(10 * 1024 * 1024, total_size // NUM_PROCESSES)
+        return
     
-    chunks = []
-    current_chunk = []
-    current_chunk_size = 0
+    # mmap cannot map an empty file
+    if total_size == 0:
+        return
+        
+    with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        start = 0
+        while start < total_size:
+            # Extend each chunk to the end of the line it stops in
+            end = mm.find(b'\n', start + CHUNK_SIZE)
+            end = total_size if end == -1 else end + 1
+            yield file_path, start, end
+            start = end
 
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            for line in f:
-                current_chunk.append(line)
-                current_chunk_size += len(line.encode('utf-8'))
-                
-                if current_chunk_size >= chunk_size_bytes and len(current_chunk) > 0:
-                    chunks.append(current_chunk)
-                    current_chunk = []
-                    current_chunk_size = 0
-            
-            if current_chunk:
-                chunks.append(current_chunk)
-                
-    except FileNotFoundError:
-        print(f"Error: File '{file_path}' not found.", file=sys.stderr)
-        sys.exit(1)
-    except Exception as e:
-        print(f"An unexpected error occurred during file reading: {e}", file=sys.stderr)
-        sys.exit(1)
+def merge_counts(total, partial):
+    """
+    Adds the counts of one Counter into another and returns the merged Counter.
+    The smaller Counter is always folded into the larger one, so the per-key
+    loop runs over as few keys as possible.
+    """
+    if len(partial) > len(total):
+        total, partial = partial, total
         
-    return chunks
+    total_get = total.get
+    for word, count in partial.items():
+        total[word] = total_get(word, 0) + count
+        
+    return total
 
 def process_file_and_sort(file_path):
     """
     Coordinates the parallel processing of the file, merges results, and sorts them.
     """
-    chunks = file_to_chunks(file_path)
-    
-    if not chunks:
-        return []
-        
-    print(f"Using {NUM_PROCESSES} CPU cores to process {len(chunks)} chunks...")
+    print(f"Using {NUM_PROCESSES} CPU cores to process the file in chunks...")
     
-    all_counters = []
-    
-    with Pool(NUM_PROCESSES) as pool:
-        all_counters = pool.map(process_chunk_for_words, chunks)
-
     final_counter = Counter()
-    for counter in all_counters:
-        final_counter.update(counter)
+    
+    try:
+        with Pool(NUM_PROCESSES) as pool:
+            # Merge each chunk's counts as soon as it finishes
+            for counter in pool.imap_unordered(process_chunk_for_words, file_to_chunks(file_path), chunksize=1):
+                final_counter = merge_counts(final_counter, counter)
+    except FileNotFoundError:
+        print(f"Error: File '{file_path}' not found.", file=sys.stderr)
+        sys.exit(1)
+    except Exception as e:
+        print(f"An unexpected error occurred during file reading: {e}", file=sys.stderr)
+        sys.exit(1)
         
     if not final_counter:
         return []
@@ -95,7 +111,7 @@ def process_file_and_sort(file_path):
     # Sorting: By count (descending), then by word (ascending)
     sorted_words_with_count = sorted(
         final_counter.items(), 
-        key=lambda item: (item[1], item[0]), 
+        key=itemgetter(1, 0), 
         reverse=True
     )
 
@@ -110,8 +126,10 @@ def save_results_to_file(data_list, output_path):
     """
     try:
         with open(output_path, 'w', encoding='utf-8') as f:
-            for word in data_list:
-                f.write(word + '\n')
+            # One joined write instead of a write call per word
+            if data_list:
+                f.write('\n'.join(data_list))
+                f.write('\n')
         print(f"\nSuccessfully saved {len(data_list)} unique words to: {output_path}")
     except Exception as e:
         print(f"\nError: Could not save results to file '{output_path}'. Reason: {e}", file=sys.stderr)
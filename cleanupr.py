@@ -3,6 +3,9 @@
 import subprocess
 import os
 
+# Buffer size for file I/O: 1 MiB instead of the 8 KiB default
+BUFFER_SIZE = 1 << 20
+
 def run_and_rename_cleanup(input_file, temp_output_file="file2", command_binary="./cleanup-rules.bin", command_arg="2"):
     """
     Runs an external command, adds a rule to the start of the output file,
@@ -18,16 +21,21 @@ def run_and_rename_cleanup(input_file, temp_output_file="file2", command_binary=
         bool: True if the operation succeeded, False otherwise.
     """
     # Defined rule to add to the start
-    RULE_TO_ADD = ":\n"
+    RULE_TO_ADD = b":\n"
     
     # 1. Command construction and execution
     print(f"Running command: {command_binary} {command_arg} with input from {input_file} and output to {temp_output_file}...")
 
     try:
-        # Open the input file for reading
-        with open(input_file, 'r') as infile:
+        # Open the input file for reading. Both files are only handed to the
+        # child process as descriptors, so binary mode skips the text layer.
+        with open(input_file, 'rb', buffering=BUFFER_SIZE) as infile:
             # Open the output file for writing
-            with open(temp_output_file, 'w') as outfile:
+            with open(temp_output_file, 'wb', buffering=BUFFER_SIZE) as outfile:
+                # Write the rule first so the command output lands after it.
+                # Flush before the child process starts writing to the same file.
+                outfile.write(RULE_TO_ADD)
+                outfile.flush()
                 # Execute the command.
                 result = subprocess.run(
                     [command_binary, command_arg],
@@ -48,36 +56,24 @@ def run_and_rename_cleanup(input_file, temp_output_file="file2", command_binary=
         print(f"An unknown error occurred during command execution: {e}")
         return False
     
-    # --- ADDING THE RULE TO THE START OF THE OUTPUT FILE ---
-    try:
-        print(f"Adding rule to the start of file: {temp_output_file}...")
-
-        # Read the entire content of the temporary file
-        with open(temp_output_file, 'r') as f:
-            content = f.read()
-
-        # Write the file again, adding the rule to the start
-        with open(temp_output_file, 'w') as f:
-            f.write(RULE_TO_ADD)
-            f.write(content)
-
-        print("Rule added successfully.")
-
-    except FileNotFoundError:
-        print(f"ERROR: File {temp_output_file} not found after command execution. Did the command create it?")
-        return False
-    except Exception as e:
-        print(f"An error occurred while modifying the file: {e}")
-        return False
-    # ---------------------------------------------------
-
     # 2. Count lines in the output file (file2) (now with the rule)
     line_count = 0
     try:
         print(f"Counting lines in file: {temp_output_file}...")
-        with open(temp_output_file, 'r') as f:
-            for _ in f:
-                line_count += 1
+        # Count newlines in binary chunks, reading into one reusable buffer
+        buf = bytearray(BUFFER_SIZE)
+        last_byte = None
+        with open(temp_output_file, 'rb', buffering=0) as f:
+            while True:
+                n = f.readinto(buf)
+                if not n:
+                    break
+                # Only the first n bytes are fresh; the rest is stale data
+                line_count += buf.count(b'\n', 0, n)
+                last_byte = buf[n - 1]
+        # A final line without a trailing newline still counts as a line
+        if last_byte is not None and last_byte != ord('\n'):
+            line_count += 1
         print(f"Found {line_count} lines.")
 
     except FileNotFoundError:
@@ -1,15 +1,16 @@
 #!/usr/bin/env python3
+# -*- coding: utf-8 -*-
 
 """
-Cyrillic Word Extractor with Mojibake Fix
+Cyrillic Word Extractor
 
-This script processes one or more text files to extract words containing Cyrillic characters,
-while addressing common mojibake issues caused by incorrect text encoding (e.g., UTF-8 bytes
-misinterpreted as Windows-1252). It is designed to handle large files efficiently with low RAM usage.
+This script processes one or more text files to extract words containing Cyrillic characters.
+Input is decoded as UTF-8, with undecodable bytes replaced, so lines with stray bytes in other
+encodings are still scanned. It is designed to handle large files efficiently with low RAM usage.
 
 Key Features:
 - Reads multiple .txt files specified by the user.
-- Attempts to fix mojibake in lines by re-encoding text from Windows-1252 to UTF-8.
+- Decodes input as UTF-8, replacing invalid bytes instead of dropping the line.
 - Extracts words containing at least one Cyrillic character (including words with digits and special chars).
 - Collects extracted words from all input files, removes duplicates, sorts them alphabetically.
 - Saves the unique sorted list of words to a user-specified output file.
@@ -28,83 +29,110 @@ Example:
 
 Output:
     - A file containing unique Cyrillic words extracted from the input files, one per line.
-
-Note:
-    The script handles mojibake commonly arising from UTF-8 encoded text being incorrectly decoded as Windows-1252,
-    improving extraction accuracy for Cyrillic text.
 """
 import os
 import re
-import tempfile
+import mmap
+import sys
 from pathlib import Path
+from multiprocessing import Pool
 
-def fix_mojibake(text):
-    """
-    Attempts to fix mojibake caused by decoding UTF-8 bytes as Windows-1252.
-    If decoding fails, returns the original text.
-    """
-    try:
-        return text.encode('windows-1252').decode('utf-8')
-    except (UnicodeEncodeError, UnicodeDecodeError):
-        return text
+# Number of CPU cores to use for scanning files in parallel.
+NUM_PROCESSES = os.cpu_count() or 4
+
+# Words containing at least one character from the Cyrillic (U+0400-U+04FF)
+# or Cyrillic Supplement (U+0500-U+052F) blocks. Compiled once at import so
+# the per-line loop does not go through the re module cache.
+_CYR_RE = re.compile(r'\b[\w@#%&*+!.\-]*[\u0400-\u04FF\u0500-\u052F]+[\w@#%&*+!.\-]*\b')
+# UTF-8 lead bytes of those two blocks (0xD0-0xD3 and 0xD4). A raw line
+# without any of them cannot contain a Cyrillic word, so it is skipped
+# before decoding.
+_HAS_CYR_BYTES = re.compile(rb'[\xd0-\xd4]')
 
 def extract_cyrillic_words(line):
     """
     Extract words containing at least one Cyrillic character.
     Allows digits and special characters in the word.
     """
-    return re.findall(r'\b[\w@#%&*+!.\-]*[Ð°-ÑÐ-Ð¯Ñ‘Ð]+[\w@#%&*+!.\-]*\b', line)
+    return _CYR_RE.findall(line)
+
+def extract_file(file_path):
+    """
+    Worker entry point: extracts the unique Cyrillic words of one file.
+    Returns (file_path, words, total_found, error), where error is None on success.
+    """
+    words_found = set()
+    total_found = 0
+    try:
+        # mmap cannot map an empty file
+        if os.path.getsize(file_path) == 0:
+            return file_path, words_found, total_found, None
+
+        # Memory-map the file and let the lead-byte regex jump straight to the
+        # next line that can contain Cyrillic text, skipping all others unread
+        with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # The mapping is scanned front to back; let the kernel read ahead
+            if hasattr(mm, 'madvise') and hasattr(mmap, 'MADV_SEQUENTIAL'):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            search = _HAS_CYR_BYTES.search
+            pos = 0
+            while True:
+                hit = search(mm, pos)
+                if hit is None:
+                    break
+
+                start = mm.rfind(b'\n', 0, hit.start()) + 1
+                end = mm.find(b'\n', hit.end())
+                if end == -1:
+                    end = len(mm)
+                pos = end + 1
+
+                # Invalid bytes become U+FFFD instead of raising per line
+                line = mm[start:end].decode('utf-8', errors='replace')
+
+                words = extract_cyrillic_words(line)
+                words_found.update(words)
+                total_found += len(words)
+
+    except Exception as e:
+        return file_path, words_found, total_found, e
+
+    return file_path, words_found, total_found, None
 
 def process_files(file_paths, output_file):
-    temp_file = tempfile.NamedTemporaryFile(delete=False, mode='w+', encoding='utf-8')
+    # Only unique words are kept in memory; duplicates never leave the workers
+    seen = set()
     total_written = 0
 
-    for file_path in file_paths:
-        print(f"ðŸ“„ Processing: {file_path}")
-        try:
-            # Read as binary to fix mojibake reliably
-            with open(file_path, 'rb') as f:
-                for raw_line in f:
-                    # Try decode UTF-8 first
-                    try:
-                        line = raw_line.decode('utf-8')
-                    except UnicodeDecodeError:
-                        # fallback: decode as Windows-1252 and fix mojibake
-                        try:
-                            line = fix_mojibake(raw_line.decode('windows-1252', errors='replace'))
-                        except Exception:
-                            # if all fails, skip line
-                            continue
-
-                    words = extract_cyrillic_words(line)
-                    for w in words:
-                        temp_file.write(w + '\n')
-                        total_written += 1
-
-        except Exception as e:
-            print(f"âŒ Error reading {file_path}: {e}")
-
-    temp_file.flush()
-    temp_file.seek(0)
-
-    print(f"\nðŸ§  Extracted approx. {total_written:,} words. Removing duplicates and sorting...")
-
-    unique_words = sorted(set(temp_file.read().splitlines()))
-
-    print(f"ðŸ’¾ Writing {len(unique_words):,} unique words to: {output_file}")
+    # Each file is scanned by its own worker process
+    num_processes = min(len(file_paths), NUM_PROCESSES)
+    with Pool(num_processes) as pool:
+        # Results arrive once a worker has finished its file, so report completion
+        for file_path, words, total_found, error in pool.imap(extract_file, file_paths):
+            if error is not None:
+                print(f"❌ Error reading {file_path}: {error}")
+            print(f"📄 Processed: {file_path} ({total_found:,} words)")
+            seen |= words
+            total_written += total_found
+
+    print(f"\n🧠 Extracted approx. {total_written:,} words. Removing duplicates and sorting...")
+
+    unique_words = sorted(seen)
+
+    print(f"💾 Writing {len(unique_words):,} unique words to: {output_file}")
     with open(output_file, 'w', encoding='utf-8') as out_f:
-        for word in unique_words:
-            out_f.write(word + '\n')
+        # One joined write instead of a write call per word
+        if unique_words:
+            out_f.write('\n'.join(unique_words))
+            out_f.write('\n')
 
-    temp_file.close()
-    os.remove(temp_file.name)
-    print("âœ… Done!")
+    print("✅ Done!")
 
 def main():
-    print("ðŸ”  Cyrillic Word Extractor with Mojibake Fix (Multi-file, Low RAM)")
+    print("🔠 Cyrillic Word Extractor (Multi-file, Low RAM)")
     
-    print("\nðŸ“‚ Enter paths to .txt files to process (one per line).")
-    print("ðŸ›‘ Leave an empty line to finish.\n")
+    print("\n📂 Enter paths to .txt files to process (one per line).")
+    print("🛑 Leave an empty line to finish.\n")
 
     file_paths = []
     while True:
@@ -112,22 +140,29 @@ def main():
         if not path:
             break
         if not os.path.isfile(path):
-            print("âŒ Not a valid file path.")
+            print("❌ Not a valid file path.")
         elif not path.lower().endswith('.txt'):
-            print("âš ï¸ Only .txt files are allowed.")
+            print("⚠️ Only .txt files are allowed.")
         else:
             file_paths.append(path)
 
     if not file_paths:
-        print("âŒ No valid files provided. Exiting.")
+        print("❌ No valid files provided. Exiting.")
         return
 
-    output_file = input("\nðŸ’¾ Enter path for output file (e.g., result.txt): ").strip()
+    output_file = input("\n💾 Enter path for output file (e.g., result.txt): ").strip()
     if not output_file:
-        print("âŒ Output file path is required.")
+        print("❌ Output file path is required.")
         return
 
     process_files(file_paths, output_file)
 
 if __name__ == '__main__':
+    if sys.platform.startswith('win') or sys.platform == 'darwin':
+        try:
+            from multiprocessing import freeze_support
+            freeze_support()
+        except ImportError:
+            pass
+
     main()
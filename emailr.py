@@ -27,10 +27,22 @@ Usage:
         3. Comma-separated list of domains to filter.
         4. Path to save the output Hashcat rules.
 """
+import os
 import sys
-import re
+import string
 from collections import Counter, defaultdict
 
+# Buffer size for reading input files: 1 MiB instead of the 8 KiB default
+BUFFER_SIZE = 1 << 20
+
+class _RuleTable(dict):
+    """str.translate table mapping each character to its '$c' append rule, filled on first use."""
+    def __missing__(self, code_point):
+        rule = self[code_point] = '$' + chr(code_point)
+        return rule
+
+_RULE_TABLE = _RuleTable()
+
 def get_file_path(prompt):
     """Handles continuous prompting until a non-empty path is entered."""
     while True:
@@ -58,61 +70,95 @@ def extract_data_from_email(email):
     Extracts the local part and domain from an email.
     Returns (digits, domain) if the local part ends in digits, otherwise None.
     """
-    # Regex to validate email structure and separate user/domain
-    match = re.match(r'^([a-zA-Z0-9._%+-]+)@([a-zA-Z0-9.-]+\.[a-zA-Z]{2,})$', email.strip())
-    if not match:
+    # Split on the last '@' instead of validating the whole address with a regex
+    # The caller passes lines that are already stripped
+    user, sep, domain = email.rpartition('@')
+    if not sep:
+        return None
+    # Only a local part ending in a digit can have trailing digits
+    if not user or not '0' <= user[-1] <= '9':
         return None
-    
-    user, domain = match.groups()
     domain = domain.lower() # Normalize domain to lowercase
     
-    # Check for trailing digits in the local part (username)
-    digits_match = re.search(r'(\d+)$', user)
-    
-    if digits_match:
-        digits = digits_match.group(1)
-        return digits, domain
-        
+    # Trailing digits of the local part (username): strip them off in C and
+    # slice back what was removed; the check above guarantees at least one
+    digits = user[len(user.rstrip(string.digits)):]
+    return digits, domain
+
+def split_email_line(line):
+    """
+    Returns the email part of a stripped input line, or None if it contains no email.
+    Handles 'hash:mail' lines by ignoring the hash part.
+    """
+    _, sep, tail = line.partition(':')
+    if sep and '@' in tail:
+        return tail
+    if '@' in line:
+        return line
     return None
 
 def string_to_hashcat_rule(s):
     """Converts a string (e.g., '123@gmail.com') to a Hashcat rule (e.g., '$1$2$3$@$g$m$a$i$l$.$c$o$m')."""
-    return ''.join(f"${c}" for c in s)
-
-def print_top_domains(file_path, limit):
-    """Reads the file, counts all domains, and prints the top 'limit' domains.
-       Now handles 'hash:mail' lines by ignoring the hash part."""
-    domain_counts = Counter()
+    return s.translate(_RULE_TABLE)
+
+def scan_file(file_path):
+    """Reads the file once and collects everything the later steps need.
+       Handles 'hash:mail' lines by ignoring the hash part.
+       Returns (domain_counts, counter), or None if the file could not be read."""
+    # defaultdict(int) increments are much cheaper than Counter's in this loop,
+    # so both tallies use one; memory stays proportional to the unique keys
+    domain_counts = defaultdict(int)
+    counter = defaultdict(int)
     
     try:
         # FIX: Added errors='ignore' to handle non-UTF-8 characters gracefully
-        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+        with open(file_path, 'r', encoding='utf-8', errors='ignore', buffering=BUFFER_SIZE) as f:
+            # The file is read front to back; let the kernel read ahead. This is
+            # only a hint, and pipes and FIFOs reject it with ESPIPE
+            if hasattr(os, 'posix_fadvise'):
+                try:
+                    os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+                except OSError:
+                    pass
+
+            # Bind the per-line helpers to locals to skip global/attribute lookups
+            split_line = split_email_line
+            extract = extract_data_from_email
+
             for line in f:
                 line = line.strip()
                 if not line:
                     continue
 
-                # Handle 'hash:mail' format by splitting and taking the second part
-                if ':' in line and '@' in line.split(':', 1)[-1]:
-                    email = line.split(':', 1)[-1]
-                elif '@' in line:
-                    email = line
-                else:
+                email = split_line(line)
+                if email is None:
                     continue
 
                 # Extract domain from the email part
-                if '@' in email:
-                    _, domain = email.rsplit('@', 1)  
-                    if domain:
-                        domain_counts[domain.lower()] += 1
+                user, _, domain = email.rpartition('@')
+                if domain:
+                    domain_counts[domain.lower()] += 1
+
+                # Skip the call entirely unless the local part ends in a digit
+                if not user or not '0' <= user[-1] <= '9':
+                    continue
+
+                extracted = extract(email)
+                
+                if extracted:
+                    counter[extracted] += 1
     except FileNotFoundError:
         print(f"\nError: File not found at '{file_path}'", file=sys.stderr)
-        return False
+        return None
     except Exception as e:
         print(f"\nAn error occurred while reading the file: {e}", file=sys.stderr)
-        return False
+        return None
 
-    top_domains_list = domain_counts.most_common(limit)
+    return domain_counts, counter
+
+def print_top_domains(domain_counts, limit):
+    """Prints the top 'limit' domains from the collected domain counts."""
+    top_domains_list = Counter(domain_counts).most_common(limit)
     
     print("\n" + "="*50)
     print(f"🥇 Top {len(top_domains_list)} Domains Found in the Input File:")
@@ -120,8 +166,6 @@ def print_top_domains(file_path, limit):
     # Print the top domains comma-separated for easy copy-paste
     print(','.join(domain for domain, count in top_domains_list))
     print("="*50 + "\n")
-    
-    return True
 
 def main():
     """Main function to handle user input, file processing, and rule generation."""
@@ -133,10 +177,14 @@ def main():
     # 2. Get Domain Display Limit
     domain_limit = get_integer_input("Enter the maximum number of top domains to display")
     
-    # 3. Display Top Domains
-    if not print_top_domains(input_path, limit=domain_limit):
+    # 3. Read the file once, then display Top Domains
+    print("\nProcessing file...")
+    scanned = scan_file(input_path)
+    if scanned is None:
         # Exit if file reading failed
         sys.exit(1)
+    domain_counts, counter = scanned
+    print_top_domains(domain_counts, limit=domain_limit)
         
     # 4. Get Domains to Filter
     domains_input = input("Enter comma-separated domains to filter (e.g., gmail.com,yahoo.com): ").strip()
@@ -150,62 +198,31 @@ def main():
         print("\nWarning: No domains were specified for filtering. Exiting.", file=sys.stderr)
         sys.exit(0)
         
-    counter = Counter()
-    examples = defaultdict(list) 
-
-    print("\nProcessing file...")
-    
-    try:
-        # FIX: Added errors='ignore' to handle non-UTF-8 characters gracefully
-        with open(input_path, 'r', encoding='utf-8', errors='ignore') as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                
-                # --- LOGIC FOR HANDLING 'hash:mail' ---
-                if ':' in line and '@' in line.split(':', 1)[-1]:
-                    # Assumes format is always 'hash:email', take the part after the first colon
-                    email = line.split(':', 1)[-1]
-                else:
-                    # Treat the whole line as a plain email
-                    email = line
-                # --- END LOGIC ---
-
-                extracted = extract_data_from_email(email)
-                
-                if extracted:
-                    digits, domain = extracted
-                    if domain in domains_to_include:
-                        key = (digits, domain)
-                        counter[key] += 1
-                        # Store a few examples for display later
-                        if len(examples[key]) < 3:
-                            # Store the original input line (hash:mail or plain email) as the example
-                            examples[key].append(line)
-    except Exception as e:
-        print(f"An error occurred during file processing: {e}", file=sys.stderr)
-        sys.exit(1)
-
+    # Keep only the combinations for the requested domains
+    counter = Counter({key: count for key, count in counter.items() if key[1] in domains_to_include})
 
-    sorted_items = counter.most_common()
+    # Sort the keys by count directly; unlike most_common() this builds no (key, count) pairs
+    sorted_keys = sorted(counter, key=counter.__getitem__, reverse=True)
 
     # 6. Write Rules to Output File
     try:
-        with open(output_path, 'w', encoding='utf-8') as out:
-            for (digits, domain), count in sorted_items:
-                # Rule format: '$d$i$g$i$t$s$@$d$o$m$a$i$n$.$c$o$m'
-                rule = string_to_hashcat_rule(digits + '@' + domain)
-                out.write(f"{rule}\n")
+        # Rule format: '$d$i$g$i$t$s$@$d$o$m$a$i$n$.$c$o$m'
+        # The '@domain' part and the line ending are the same for every rule of
+        # a domain, so convert them once
+        domain_suffixes = {domain: string_to_hashcat_rule('@' + domain) + '\n' for domain in domains_to_include}
+        with open(output_path, 'w', encoding='utf-8', buffering=BUFFER_SIZE) as out:
+            # Stream the rules through the write buffer without building a list
+            # or one joined string of the whole output
+            out.writelines(string_to_hashcat_rule(digits) + domain_suffixes[domain] for digits, domain in sorted_keys)
     except Exception as e:
         print(f"Error writing to output file '{output_path}': {e}", file=sys.stderr)
         sys.exit(1)
 
 
     # 7. Display Summary (Top 5 display removed)
-    print(f"\nDone! {len(sorted_items)} rules written to {output_path}")
+    print(f"\nDone! {len(sorted_keys)} rules written to {output_path}")
 
-    if not sorted_items:
+    if not sorted_keys:
         print(" No patterns found matching the specified domains and having trailing digits.")
         return
 
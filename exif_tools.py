@@ -1,5 +1,7 @@
 import os
 import sys
+import argparse
+from multiprocessing import Pool
 from PIL import Image
 from PIL.ExifTags import TAGS
 
@@ -11,6 +13,8 @@ from PIL.ExifTags import TAGS
 
 IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp', '.tiff', '.tif')
 CLEAN_SUFFIX = "_CLEANED"
+# Number of CPU cores to use for cleaning files in batch mode.
+NUM_PROCESSES = os.cpu_count() or 4
 
 def view_exif_data(input_path):
     """
@@ -62,12 +66,12 @@ def remove_exif_data(input_path):
         # 1. Open the image
         img = Image.open(input_path)
         
-        # 2. Extract image data without EXIF (discarding the 'info' dictionary)
-        data = list(img.getdata())
+        # 2. Extract the raw pixel buffer without EXIF (discarding the 'info' dictionary)
+        data = img.tobytes()
         
-        # 3. Create a new image from the raw data
-        new_img = Image.new(img.mode, img.size)
-        new_img.putdata(data)
+        # 3. Create a new image from the raw data; a single buffer copy in C
+        #    instead of a Python object per pixel
+        new_img = Image.frombytes(img.mode, img.size, data)
         
         # 4. Determine save arguments (copying format but excluding EXIF)
         save_kwargs = {}
@@ -86,6 +90,16 @@ def remove_exif_data(input_path):
 
 def main():
     """Main function to perform interactive, non-recursive EXIF cleaning."""
+    parser = argparse.ArgumentParser(
+        description="Removes EXIF data from the images in the current directory."
+    )
+    parser.add_argument(
+        '--batch',
+        action='store_true',
+        help="Clean every eligible image without prompting, using one worker process per CPU core."
+    )
+    args = parser.parse_args()
+
     print("--- Safe Interactive EXIF Cleaner ---")
     print("WARNING: This script processes files ONLY in the current directory.")
     print("It requires the 'Pillow' library: pip install Pillow")
@@ -106,6 +120,12 @@ def main():
         return
 
     print(f"Found {len(image_files)} image file(s) to process.")
+
+    if args.batch:
+        # Each image is decoded and re-encoded independently, so clean them in parallel
+        with Pool(min(len(image_files), NUM_PROCESSES)) as pool:
+            pool.map(remove_exif_data, image_files)
+        return
     
     for filename in image_files:
         print(f"\nProcessing: {filename}")
@@ -130,4 +150,11 @@ def main():
                 print("Invalid input. Please use 'y', 'n', 'v', or 'q'.")
 
 if __name__ == "__main__":
+    if sys.platform.startswith('win') or sys.platform == 'darwin':
+        try:
+            from multiprocessing import freeze_support
+            freeze_support()
+        except ImportError:
+            pass
+
     main()
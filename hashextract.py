@@ -1,8 +1,17 @@
 #!/usr/bin/env python3
 import os
+import sys
 import re
+import mmap
+from functools import partial
+from multiprocessing import Pool
 from tqdm import tqdm
-from typing import List, Set, Optional, Dict
+from typing import List, Set, Optional, Dict, Iterator
+
+# Number of CPU cores to use for scanning files in parallel.
+NUM_PROCESSES = os.cpu_count() or 4
+# Approximate size of the line-aligned windows a mapped file is scanned in.
+CHUNK_SIZE = 1 << 16
 
 # ==============================================================================
 # REGULAR EXPRESSIONS FOR COMMON PASSWORD HASHES
@@ -15,6 +24,9 @@ HEX_HASH_PATTERNS = {
     "SHA-384_96": r'\b[a-fA-F0-9]{96}\b',   # 96
     "SHA-512_128": r'\b[a-fA-F0-9]{128}\b',  # 128
 }
+# All of the above in one pattern: a standalone hex run of 32-128 characters.
+# Mode 1 scans with this once and buckets each match by its length.
+HEX_HASH_ANY_LENGTH = re.compile(r'\b[a-fA-F0-9]{32,128}\b')
 
 # Definitions for structural hashes (identified by format/prefix) (Mode 2)
 STRUCTURAL_HASH_PATTERNS = {
@@ -48,22 +60,80 @@ def get_file_list(root_dir: str, extensions: List[str]) -> List[str]:
                 matched_files.append(os.path.join(dirpath, filename))
     return matched_files
 
-def extract_hashes_from_file_by_pattern(filepath: str, pattern: re.Pattern) -> Set[str]:
+def iter_spans(mm, size):
+    """Splits a mapped file into (start, end) byte ranges of about 'size' bytes that end on a line break."""
+    start = 0
+    total = len(mm)
+    while start < total:
+        newline = mm.find(b"\n", start + size)
+        end = total if newline == -1 else newline + 1
+        yield start, end
+        start = end
+
+def read_file_texts(filepath: str) -> Iterator[str]:
     """
-    Extracts strings matching a compiled regex pattern from the file.
+    Yields the decoded contents of the file in pieces that end on a line break:
+    windows of about CHUNK_SIZE bytes of a memory map when possible, otherwise
+    single lines (empty files, pipes and other special files cannot be mapped).
+    Invalid UTF-8 is dropped, as when the file is read in text mode.
     """
-    hashes = set()
-    try:
-        with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
+    with open(filepath, 'rb') as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):
             for line in f:
-                # Use findall on the entire line to capture multi-part hashes like $hash:$salt
-                found = pattern.findall(line)
-                for h in found:
-                    hashes.add(h)
+                yield line.decode('utf-8', errors='ignore')
+            return
+        with mm:
+            for start, end in iter_spans(mm, CHUNK_SIZE):
+                yield mm[start:end].decode('utf-8', errors='ignore')
+
+def extract_hashes_from_file_by_patterns(filepath: str, patterns: Dict[str, re.Pattern]) -> Dict[str, Set[str]]:
+    """
+    Extracts strings matching each of the compiled regex patterns from the file,
+    reading it once for all of them. Returns { pattern_name: set_of_hashes }.
+    """
+    # The patterns overlap (e.g. NTLM_32 and the vBulletin hash part), so each one
+    # still runs on its own over the data instead of as a single alternation
+    hashes: Dict[str, Set[str]] = {name: set() for name in patterns}
+    matchers = [(pattern.findall, hashes[name]) for name, pattern in patterns.items()]
+    try:
+        for text in read_file_texts(filepath):
+            # None of the patterns can match across a newline, so scanning a
+            # window of whole lines finds the same multi-part hashes like $hash:$salt
+            for findall, found in matchers:
+                found.update(findall(text))
     except Exception as e:
         print(f"\n[!] Warning: Could not read file {filepath}: {e}")
     return hashes
 
+def extract_hex_hashes_by_length(filepath: str, lengths: Set[int]) -> Dict[int, Set[str]]:
+    """
+    Extracts standalone hex strings whose length is in 'lengths' from the file,
+    scanning it once for all lengths. Returns { length: set_of_hashes }.
+    """
+    hashes: Dict[int, Set[str]] = {length: set() for length in lengths}
+    try:
+        for text in read_file_texts(filepath):
+            for h in HEX_HASH_ANY_LENGTH.findall(text):
+                bucket = hashes.get(len(h))
+                if bucket is not None:
+                    bucket.add(h)
+    except Exception as e:
+        print(f"\n[!] Warning: Could not read file {filepath}: {e}")
+    return hashes
+
+def scan_file(filepath: str, mode: int, targets: Dict) -> Dict[str, Set[str]]:
+    """
+    Worker entry point: scans one file for the selected hash types.
+    'targets' maps each pattern name to its length (Mode 1) or compiled pattern (Mode 2).
+    Returns { pattern_name: set_of_hashes }.
+    """
+    if mode == 1:
+        found = extract_hex_hashes_by_length(filepath, set(targets.values()))
+        return {name: found[length] for name, length in targets.items()}
+    return extract_hashes_from_file_by_patterns(filepath, targets)
+
 # ==============================================================================
 # MAIN EXECUTION LOGIC
 # ==============================================================================
@@ -97,7 +167,7 @@ def main():
         if mode not in (1, 2):
             print("[-] Please enter 1 or 2.")
             
-    # Dictionary to store results: { 'Pattern_Name': {compiled_pattern, hashes} }
+    # Dictionary to store results: { 'Pattern_Name': {compiled_pattern or length, hashes} }
     selected_patterns: Dict[str, Dict] = {}
     if mode == 1:
         # --- Mode 1: Fixed-Length Hex Extraction ---
@@ -122,8 +192,9 @@ def main():
                     if 1 <= index <= len(pattern_keys):
                         name = pattern_keys[index - 1]
                         
+                        # Fixed-length types are matched by length, not by their own pattern
                         selected_patterns[name] = {
-                            'pattern': re.compile(HEX_HASH_PATTERNS[name]),
+                            'length': int(HEX_HASH_PATTERNS[name].split('{')[1].split('}')[0]),
                             'hashes': set()
                         }
                         selected_names.append(name)
@@ -178,13 +249,16 @@ def main():
     print(f"[+] Found {total_files} matching files.")
     total_unique_hashes = 0
     
-    # Use tqdm progress bar
-    with tqdm(total=total_files, unit="file") as pbar:
-        for filepath in files:
-            for pattern_name, data in selected_patterns.items():
-                compiled_pattern = data['pattern']
-                file_hashes = extract_hashes_from_file_by_pattern(filepath, compiled_pattern)
-                data['hashes'].update(file_hashes)
+    # One scan per file covers every selected length (Mode 1) or pattern (Mode 2)
+    key = 'length' if mode == 1 else 'pattern'
+    targets = {name: data[key] for name, data in selected_patterns.items()}
+    worker = partial(scan_file, mode=mode, targets=targets)
+    
+    # Files are scanned in parallel worker processes; use tqdm progress bar
+    with Pool(NUM_PROCESSES) as pool, tqdm(total=total_files, unit="file") as pbar:
+        for file_result in pool.imap_unordered(worker, files):
+            for pattern_name, file_hashes in file_result.items():
+                selected_patterns[pattern_name]['hashes'].update(file_hashes)
             
             # Sum the unique hashes for the progress bar
             total_unique_hashes = sum(len(data['hashes']) for data in selected_patterns.values())
@@ -212,9 +286,9 @@ def main():
             try:
                 # Open file in write mode ('w')
                 with open(output_file, 'w') as f:
-                    # Write the sorted list of unique hashes
-                    for h in sorted(hashes):
-                        f.write(h + '\n')
+                    # Write the sorted list of unique hashes in one joined write
+                    f.write('\n'.join(sorted(hashes)))
+                    f.write('\n')
                 print(f"   - [+] Saved {len(hashes)} unique {pattern_name} hashes to {output_file}")
                 save_count += 1
             except Exception as e:
@@ -226,4 +300,11 @@ def main():
         print("\n[!] No hashes were saved (zero found or file error).")
 
 if __name__ == "__main__":
+    if sys.platform.startswith('win') or sys.platform == 'darwin':
+        try:
+            from multiprocessing import freeze_support
+            freeze_support()
+        except ImportError:
+            pass
+
     main()
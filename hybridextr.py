@@ -7,8 +7,12 @@ including length-limited edge masks (?x?x...WORD) and full password masks (?u?l?
 
 import string
 import os
+import sys
+import mmap
 import argparse 
 from collections import Counter
+from operator import itemgetter
+from multiprocessing import Pool
 
 # --- Constants for all Hashcat Charsets ---
 LOWER_CHARS = string.ascii_lowercase
@@ -18,29 +22,36 @@ SPECIAL_CHARS = string.punctuation
 # COMBINED_CHARS is useful for filtering non-standard characters
 COMBINED_CHARS = LOWER_CHARS + UPPER_CHARS + DIGIT_CHARS + SPECIAL_CHARS
 
+# --- Parallel processing ---
+# Number of CPU cores to use for mask extraction.
+NUM_PROCESSES = os.cpu_count() or 4
+# Approximate number of input bytes handed to a worker per task.
+CHUNK_SIZE = 1 << 23
+
+# Character -> Hashcat mask character, so classifying a character is a single
+# dict lookup instead of a chain of membership scans over the charset strings
+MASK_MAP = {}
+MASK_MAP.update(dict.fromkeys(UPPER_CHARS, "?u"))
+MASK_MAP.update(dict.fromkeys(LOWER_CHARS, "?l"))
+MASK_MAP.update(dict.fromkeys(SPECIAL_CHARS, "?s"))
+MASK_MAP.update(dict.fromkeys(DIGIT_CHARS, "?d"))
+# The same mapping as a str.translate table for whole-password masks
+FULL_MASK_TABLE = str.maketrans(MASK_MAP)
+
 def get_char_type(char):
     """Maps a character to its corresponding Hashcat mask character."""
-    if char in DIGIT_CHARS:
-        return "?d"
-    elif char in SPECIAL_CHARS:
-        return "?s"
-    elif char in LOWER_CHARS:
-        return "?l"
-    elif char in UPPER_CHARS:
-        return "?u"
-    else:
-        # Returns None for non-standard characters (e.g., spaces, control chars)
-        return None
+    # Returns None for non-standard characters (e.g., spaces, control chars)
+    return MASK_MAP.get(char)
 
-def read_file_safe(path):
-    """Reads a file with encoding error handling."""
-    try:
-        with open(path, "r", encoding="utf-8") as f:
-            return f.readlines()
-    except UnicodeDecodeError:
-        # Fallback with invalid byte replacement for problematic files
-        with open(path, "r", encoding="utf-8", errors="replace") as f:
-            return f.readlines()
+def iter_spans(mm, size):
+    """Splits a mapped file into (start, end) byte ranges of about 'size' bytes that end on a line break."""
+    start = 0
+    total = len(mm)
+    while start < total:
+        newline = mm.find(b"\n", start + size)
+        end = total if newline == -1 else newline + 1
+        yield start, end
+        start = end
 
 # --- NEW FEATURE: Full Mask Extraction ---
 def extract_full_mask(password):
@@ -49,14 +60,12 @@ def extract_full_mask(password):
     Returns the mask string, or None if the password contains non-standard characters.
     Example: "Pass123!" -> "?u?l?l?l?d?d?d?s"
     """
-    full_mask = ""
-    for ch in password:
-        char_type = get_char_type(ch)
-        if char_type:
-            full_mask += char_type
-        else:
-            # If any character is non-standard, we discard the whole mask
-            return None
+    # Every standard character becomes a two-character token; anything else is
+    # left as a single character, so a short result means a non-standard character
+    full_mask = password.translate(FULL_MASK_TABLE)
+    if len(full_mask) != 2 * len(password):
+        # If any character is non-standard, we discard the whole mask
+        return None
     
     return full_mask
 
@@ -69,37 +78,29 @@ def extract_edge_masks(password, max_length):
     """
     masks = []
     
+    # Lengths of the runs of standard characters at either end, counted by
+    # str.lstrip/rstrip in C and capped at the mask length limit (a limit
+    # below 1 yields no edge masks, and must not turn into a negative slice)
+    n = len(password)
+    limit = max(0, max_length)
+    prefix_len = min(n - len(password.lstrip(COMBINED_CHARS)), limit)
+    suffix_len = min(n - len(password.rstrip(COMBINED_CHARS)), limit)
+    if not prefix_len and not suffix_len:
+        return masks
+    
+    # Each character of both runs is standard and so becomes exactly two mask
+    # characters, which lets the edge masks be sliced out of the full translation
+    translated = password.translate(FULL_MASK_TABLE)
+    
     # 1. Prefix Extraction
-    prefix_mask = ""
-    for ch in password:
-        # Stop if the mask length limit is reached (2 characters per ?x)
-        if len(prefix_mask) // 2 >= max_length: 
-            break
-        
-        char_type = get_char_type(ch)
-        if char_type:
-            prefix_mask += char_type
-        else:
-            # The first encountered non-standard character ends the prefix
-            break
-            
+    # The first encountered non-standard character ends the prefix
+    prefix_mask = translated[:2 * prefix_len]
     if prefix_mask:
         masks.append(prefix_mask)
         
     # 2. Suffix Extraction
-    suffix_mask = ""
-    for ch in reversed(password):
-        # Stop if the mask length limit is reached
-        if len(suffix_mask) // 2 >= max_length:
-            break
-                
-        char_type = get_char_type(ch)
-        if char_type:
-            # Prepend the character type for the suffix
-            suffix_mask = char_type + suffix_mask
-        else:
-            # The first encountered non-standard character ends the suffix
-            break
+    # The first encountered non-standard character ends the suffix
+    suffix_mask = translated[len(translated) - 2 * suffix_len:]
             
     # Ensure the suffix is unique
     if suffix_mask and suffix_mask not in masks:
@@ -107,6 +108,70 @@ def extract_edge_masks(password, max_length):
         
     return masks
 
+def count_masks(lines, max_mask_length, min_mask_length, mask_type, extract_full):
+    """
+    Extracts the selected masks from a batch of lines and returns a Counter of them.
+    """
+    # Cracked password lists repeat the same passwords many times, so count the
+    # passwords first and extract the masks of each distinct password only once.
+    # Handle the hash:password format; the password follows the last ':'
+    # (without one, rpartition puts the whole line in the last slot)
+    password_counts = Counter(line.strip().rpartition(":")[2] for line in lines)
+    
+    all_masks = []
+    
+    for password, occurrences in password_counts.items():
+        # Blank lines end up here as an empty password
+        if len(password) < 5:
+            continue
+            
+        masks = []
+            
+        # 1. Edge Mask Extraction (if enabled)
+        if mask_type in ['edge', 'both']:
+            edge_masks = extract_edge_masks(password, max_mask_length)
+            # Apply minimum length filter
+            masks.extend(mask for mask in edge_masks if len(mask) // 2 >= min_mask_length)
+        
+        # 2. Full Mask Extraction (if enabled)
+        if (mask_type == 'full' or mask_type == 'both') and extract_full:
+            full_mask = extract_full_mask(password)
+            if full_mask:
+                # Full masks are not length-limited; like edge masks they are
+                # counted once per password
+                masks.append(full_mask)
+                
+        # Repeat the masks once per occurrence of the password so the Counter
+        # below still does all the counting in C
+        all_masks.extend(masks if occurrences == 1 else masks * occurrences)
+            
+    # Counting masks
+    return Counter(all_masks)
+
+def count_masks_span(input_path, start, end, max_mask_length, min_mask_length, mask_type, extract_full):
+    """
+    Worker entry point: counts the masks of the lines in one byte range of the input file.
+    Returns (counts, line_count).
+    """
+    # Each worker maps the file itself, so only the offsets cross the process boundary
+    with open(input_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        # Invalid bytes are replaced rather than failing the read
+        text = mm[start:end].decode("utf-8", errors="replace")
+        
+    # Treat '\r\n' and '\r' as line breaks too, like reading the file in text mode
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    lines = text.split("\n")
+    if not lines[-1]:
+        # Nothing follows the final line break
+        lines.pop()
+        
+    return count_masks(lines, max_mask_length, min_mask_length, mask_type, extract_full), len(lines)
+
+def _count_masks_span(args):
+    """Unpacks a task tuple for Pool.imap_unordered."""
+    return count_masks_span(*args)
+
 def main():
     # --- Argument Parsing Setup ---
     parser = argparse.ArgumentParser(
@@ -165,53 +230,52 @@ def main():
     output_path = f"{mask_type}_masks_from_{base_name}_min{min_mask_length}_max{max_mask_length}.hcmask" 
         
     try:
-        lines = read_file_safe(input_path)
+        # The file is memory-mapped and cut into line-aligned byte ranges, which
+        # are then read and decoded one at a time instead of the whole file at once
+        with open(input_path, "rb") as f:
+            if os.fstat(f.fileno()).st_size:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    spans = list(iter_spans(mm, CHUNK_SIZE))
+            else:
+                # mmap cannot map an empty file
+                spans = []
     except Exception as e:
         print(f"ERROR: Error reading file: {e}")
         return
         
-    all_masks = []
-    
-    print(f"Analyzing {len(lines)} lines to extract {mask_type} masks (min {min_mask_length}, max {max_mask_length} for edges)...") 
+    print(f"Analyzing '{input_path}' to extract {mask_type} masks (min {min_mask_length}, max {max_mask_length} for edges)...") 
         
-    for line in lines:
-        line = line.strip()
-        if not line:
-            continue
-                    
-        # Handle the hash:password format
-        password = line.split(":")[-1] if ":" in line else line
+    # Lines are independent, so byte ranges are processed in parallel worker
+    # processes and their per-range Counters merged here. With a single core
+    # the pool would only add overhead, so count in-process instead.
+    counts = Counter()
+    line_count = 0
+    tasks = [(input_path, start, end, max_mask_length, min_mask_length, mask_type, extract_full) for start, end in spans]
+    if NUM_PROCESSES == 1 or len(tasks) <= 1:
+        for span_counts, span_lines in map(_count_masks_span, tasks):
+            counts.update(span_counts)
+            line_count += span_lines
+    else:
+        with Pool(min(len(tasks), NUM_PROCESSES)) as pool:
+            for span_counts, span_lines in pool.imap_unordered(_count_masks_span, tasks):
+                counts.update(span_counts)
+                line_count += span_lines
                     
-        if len(password) < 5:
-            continue
-            
-        # 1. Edge Mask Extraction (if enabled)
-        if mask_type in ['edge', 'both']:
-            edge_masks = extract_edge_masks(password, max_mask_length)
-            # Apply minimum length filter
-            filtered_edge_masks = [mask for mask in edge_masks if len(mask) // 2 >= min_mask_length]
-            all_masks.extend(filtered_edge_masks)
+    print(f"Analyzed {line_count} lines.")
         
-        # 2. Full Mask Extraction (if enabled)
-        if (mask_type == 'full' or mask_type == 'both') and extract_full:
-            full_mask = extract_full_mask(password)
-            if full_mask:
-                # Full masks are not length-limited, but must be unique
-                if full_mask not in all_masks:
-                    all_masks.append(full_mask)
-            
-    # Counting and sorting masks
-    counts = Counter(all_masks)
-        
-    # Sorting: first by count (descending), then alphabetically (ascending)
-    sorted_masks = sorted(counts.items(), key=lambda x: (-x[1], x[0]))
+    # Sorting: first by count (descending), then alphabetically (ascending).
+    # Two stable sorts with C-level key functions replace a lambda that built a
+    # tuple per mask; sorting by mask first keeps equal counts in alphabetical order
+    sorted_masks = sorted(counts.items(), key=itemgetter(0))
+    sorted_masks.sort(key=itemgetter(1), reverse=True)
         
     # Writing to file
     try:
+        # One joined write instead of two write calls per mask
+        data = "".join([f"# Count: {count}\n{mask}\n" for mask, count in sorted_masks])
         with open(output_path, "w", encoding="utf-8") as f_out:
-            for mask, count in sorted_masks:
-                f_out.write(f"# Count: {count}\n") 
-                f_out.write(mask + "\n")
+            if data:
+                f_out.write(data)
                         
         print(f"\n--- Analysis Complete ---")
         print(f"Found {len(sorted_masks)} unique masks.") 
@@ -224,4 +288,11 @@ def main():
         print(f"ERROR: Error writing output file: {e}")
 
 if __name__ == "__main__":
+    if sys.platform.startswith('win') or sys.platform == 'darwin':
+        try:
+            from multiprocessing import freeze_support
+            freeze_support()
+        except ImportError:
+            pass
+
     main()
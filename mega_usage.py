@@ -3,6 +3,10 @@
 import sys
 import time
 import random
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from requests.adapters import HTTPAdapter
+import mega.mega as mega_api
 from mega import Mega
 from mega.errors import RequestError
 
@@ -18,6 +22,10 @@ MIN_DELAY = 5
 MAX_DELAY = 15
 # ---------------------------------------------------------------------------------
 
+# Number of accounts checked concurrently. Each check is almost entirely
+# waiting on the network, so threads are enough to overlap them.
+MAX_WORKERS = 16
+
 # Function to format bytes into a readable format (MB, GB, TB)
 def format_bytes(bytes_size):
     """Converts bytes to the most appropriate unit (MB, GB, TB)."""
@@ -38,6 +46,105 @@ def format_bytes(bytes_size):
     else:
         return f"{bytes_size} Bytes"
 
+def install_shared_session():
+    """
+    Routes the HTTP requests of every Mega client through one shared
+    requests.Session, so logins reuse open keep-alive connections instead of
+    doing a new DNS lookup and TLS handshake for each account.
+    """
+    # The mega library (mega.py) calls the module-level requests.post and
+    # requests.get functions, which open a fresh connection every time. Only
+    # those two functions are swapped for the session's methods; the module
+    # itself stays in place, so everything else the library may use from it
+    # (requests.exceptions, ...) is untouched.
+    library_requests = getattr(mega_api, 'requests', None)
+    if library_requests is not requests:
+        return
+    
+    session = requests.Session()
+    # One pooled connection per worker thread
+    adapter = HTTPAdapter(pool_maxsize=MAX_WORKERS)
+    session.mount('https://', adapter)
+    # The library ignores the 'User-Agent' option, so set it on the session
+    session.headers['User-Agent'] = WINDOWS_CHROME_USER_AGENT
+    # Session.post/get send through session.request, not these module
+    # functions, so the patch cannot recurse
+    requests.post = session.post
+    requests.get = session.get
+
+def check_account(index, line):
+    """
+    Logs into a single account and returns its report as a block of text.
+    Runs in a worker thread, so nothing is printed here; the caller prints the
+    reports in input order.
+    """
+    report = []
+    
+    # --- NEW: Add a random delay before processing the next account (Skip delay before first account) ---
+    # Each worker pauses before its own attempt, so the delays overlap instead
+    # of adding up across all accounts
+    if index > 0:
+        # The 'max(1, ...)' ensures a minimum delay of at least 1 second
+        delay_time = max(1, random.uniform(MIN_DELAY, MAX_DELAY))
+        report.append(f"😴 Paused for {delay_time:.2f} seconds to simulate human interval...")
+        time.sleep(delay_time)
+    # ----------------------------------------------------------------------------------------------------
+
+    try:
+        email, password = line.split(':', 1)
+    except ValueError:
+        report.append(f"Format error for line: {line}. Expected 'email:password'. Skipping.")
+        return "\n".join(report)
+        
+    report.append(f"[{email}] Logging in...")
+    
+    # Pass the User-Agent to the Mega constructor options
+    mega_options = {'User-Agent': WINDOWS_CHROME_USER_AGENT}
+    
+    # Instantiate the Mega client with options
+    # NOTE: Connections are reused through the requests.Session shared by all
+    # clients (see install_shared_session), a key part of "simulation."
+    # Every thread gets its own client, so no login state is shared.
+    mega = Mega(options=mega_options)
+    m = None # Mega client object
+
+    try:
+        # Attempt to log in
+        m = mega.login(email, password)
+        
+        # Retrieve storage data
+        space_data = m.get_storage_space()
+        
+        used = space_data['used']
+        total = space_data['total']
+        free = total - used
+        
+        # Format data
+        used_fmt = format_bytes(used)
+        total_fmt = format_bytes(total)
+        free_fmt = format_bytes(free)
+
+        # Calculate percentage usage
+        percentage = (used / total) * 100 if total > 0 else 0
+
+        report.append(f"  ✅ Successfully logged in.")
+        report.append(f"  ➡️ Used: **{used_fmt}** / {total_fmt} ({percentage:.2f}%)")
+        report.append(f"  ➡️ Free: {free_fmt}")
+        
+    except RequestError as e:
+        # Handle API errors
+        error_message = str(e).strip()
+        if "EACCESS" in error_message or "Invalid email or password" in error_message:
+            report.append(f"  ❌ LOGIN ERROR: Invalid email/password or access denied.")
+        else:
+            report.append(f"  ❌ API ERROR: {error_message}")
+        
+    except Exception as e:
+        # General handling for other errors
+        report.append(f"  ❌ Unexpected error: {e}")
+        
+    return "\n".join(report)
+
 def check_mega_usage(accounts_file="accounts.txt"):
     """
     Reads accounts from a file, logs in, and displays storage usage.
@@ -62,68 +169,13 @@ def check_mega_usage(accounts_file="accounts.txt"):
     print("-" * 50)
     
     # 2. Process accounts
-    for i, line in enumerate(account_lines):
-        # --- NEW: Add a random delay before processing the next account (Skip delay before first account) ---
-        if i > 0:
-            # The 'max(1, ...)' ensures a minimum delay of at least 1 second
-            delay_time = max(1, random.uniform(MIN_DELAY, MAX_DELAY))
-            print(f"😴 Pausing for {delay_time:.2f} seconds to simulate human interval...")
-            time.sleep(delay_time)
-        # ----------------------------------------------------------------------------------------------------
-
-        try:
-            email, password = line.split(':', 1)
-        except ValueError:
-            print(f"Format error for line: {line}. Expected 'email:password'. Skipping.")
-            continue
-            
-        print(f"[{email}] Logging in...")
-        
-        # Pass the User-Agent to the Mega constructor options
-        mega_options = {'User-Agent': WINDOWS_CHROME_USER_AGENT}
-        
-        # Instantiate the Mega client with options
-        # NOTE: The 'Mega' constructor typically uses a requests.Session internally,
-        # which helps in connection reuse and is a key part of "simulation."
-        mega = Mega(options=mega_options)
-        m = None # Mega client object
-
-        try:
-            # Attempt to log in
-            m = mega.login(email, password)
-            
-            # Retrieve storage data
-            space_data = m.get_storage_space()
-            
-            used = space_data['used']
-            total = space_data['total']
-            free = total - used
-            
-            # Format data
-            used_fmt = format_bytes(used)
-            total_fmt = format_bytes(total)
-            free_fmt = format_bytes(free)
-
-            # Calculate percentage usage
-            percentage = (used / total) * 100 if total > 0 else 0
-
-            print(f"  ✅ Successfully logged in.")
-            print(f"  ➡️ Used: **{used_fmt}** / {total_fmt} ({percentage:.2f}%)")
-            print(f"  ➡️ Free: {free_fmt}")
-            
-        except RequestError as e:
-            # Handle API errors
-            error_message = str(e).strip()
-            if "EACCESS" in error_message or "Invalid email or password" in error_message:
-                print(f"  ❌ LOGIN ERROR: Invalid email/password or access denied.")
-            else:
-                print(f"  ❌ API ERROR: {error_message}")
-            
-        except Exception as e:
-            # General handling for other errors
-            print(f"  ❌ Unexpected error: {e}")
-            
-        finally:
+    install_shared_session()
+    
+    # Logins run concurrently in a bounded thread pool; map() yields the
+    # reports in input order as they complete
+    with ThreadPoolExecutor(max_workers=min(len(account_lines), MAX_WORKERS)) as executor:
+        for report in executor.map(check_account, range(len(account_lines)), account_lines):
+            print(report)
             # Ensure a separating line after each operation
             print("-" * 50)
 
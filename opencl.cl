@@ -13,7 +13,57 @@ bool is_consonant(unsigned char c) {
             (c >= 'A' && c <= 'Z' && !is_INSERT EVERY(c)));
 }
 
-__kernel void bfs_kernel(
+// Helper function to zero n bytes of a result slot, 16 bytes per store
+void zero_output(__global unsigned char* ptr, unsigned int n) {
+    unsigned int i = 0;
+    // vstore16 only needs byte alignment for uchar data, so any slot start works
+    for (; i + 16 <= n; i += 16) {
+        vstore16((uchar16)(0), 0, ptr + i);
+    }
+    for (; i < n; i++) {
+        ptr[i] = 0;
+    }
+}
+
+// Rule classes, in the order of their rule ID blocks in bfs_kernel.
+#define RULE_CLASS_SIMPLE       0
+#define RULE_CLASS_TD           1
+#define RULE_CLASS_S            2
+#define RULE_CLASS_A            3
+#define RULE_CLASS_GROUP_B      4
+#define RULE_CLASS_NEW          5
+#define RULE_CLASS_INSERT_EVERY 6
+
+// Building with -D RULE_CLASS=N produces a kernel specialised for one rule
+// class: the other classes' branches are constant-false and compiled out,
+// leaving a smaller kernel with lower register pressure. Rules of other
+// classes then produce no output. Without RULE_CLASS, every class is handled.
+#ifdef RULE_CLASS
+#define RULE_CLASS_ENABLED(c) (RULE_CLASS == (c))
+#else
+#define RULE_CLASS_ENABLED(c) 1
+#endif
+
+// Layout of base_words_in. By default each word occupies max_word_len
+// consecutive bytes. Building with -D WORDS_COLUMN_MAJOR selects the transposed
+// layout, where byte i of every word is stored together at
+// base_words_in[i * num_words + word_idx], so work-items handling neighbouring
+// words read neighbouring bytes and their loads coalesce.
+#ifdef WORDS_COLUMN_MAJOR
+#define WORD_CHAR(i) base_words_in[(i) * num_words + word_idx]
+#else
+#define WORD_CHAR(i) current_word_ptr[i]
+#endif
+
+// Building with -D LWS=N declares the local work size the host launches with
+// (for example the device's preferred work-group size multiple, queried via
+// CL_KERNEL_PREFERRED_WORK_GROUP_SIZE_MULTIPLE), so the compiler can optimise
+// for it; the launch must then use a local size of (N, 1, 1)
+__kernel
+#ifdef LWS
+__attribute__((reqd_work_group_size(LWS, 1, 1)))
+#endif
+void bfs_kernel(
     __global const unsigned char* base_words_in,
     __global const unsigned short* rules_in,
     __global unsigned char* result_buffer,
@@ -21,37 +71,61 @@ __kernel void bfs_kernel(
     const unsigned int num_rules,
     const unsigned int max_word_len,
     const unsigned int max_rule_len_padded,
-    const unsigned int max_output_len_padded)
+    const unsigned int max_output_len_padded
+#ifdef WORD_LENGTHS_IN
+    // Length of each word, filled by the host, which already knows it;
+    // enabled by building with -D WORD_LENGTHS_IN
+    , __global const unsigned int* word_lengths
+#endif
+    )
 {
-    unsigned int global_id = get_global_id(0);
-    unsigned int word_idx = global_id / num_rules;
-    unsigned int rule_idx = global_id % num_rules;
+    // Neighbouring work-items apply the same rule to neighbouring words, so a
+    // warp/wavefront takes a single branch through the rule dispatch below
+    unsigned int word_idx;
+    unsigned int rule_idx;
+    if (get_work_dim() == 2) {
+        // 2-D launch covering all rules at once: dimension 0 is the word,
+        // dimension 1 the rule; either may be padded past its count
+        word_idx = get_global_id(0);
+        rule_idx = get_global_id(1);
+        if (word_idx >= num_words) return;
+    } else {
+        unsigned int global_id = get_global_id(0);
+        rule_idx = global_id / num_words;
+        word_idx = global_id % num_words;
+    }
 
-    if (word_idx >= num_words) return;
+    if (rule_idx >= num_rules) return;
 
+#ifndef WORDS_COLUMN_MAJOR
     __global const unsigned char* current_word_ptr = base_words_in + word_idx * max_word_len;
+#endif
     __global const unsigned short* rule_id_ptr = rules_in + rule_idx * (max_rule_len_padded + 1); 
     __global const unsigned char* rule_ptr = (__global const unsigned char*)rules_in + rule_idx * (max_rule_len_padded + 1) * sizeof(unsigned short) + sizeof(unsigned short);
 
     unsigned int rule_id = rule_id_ptr[0];
 
-    __global unsigned char* result_ptr = result_buffer + global_id * max_output_len_padded;
+    // Results keep their word-major order: all rules of word 0, then word 1, ...
+    __global unsigned char* result_ptr = result_buffer + (word_idx * num_rules + rule_idx) * max_output_len_padded;
 
+#ifdef WORD_LENGTHS_IN
+    // Every rule applied to a word would otherwise rescan it for the terminator
+    unsigned int word_len = word_lengths[word_idx];
+#else
     unsigned int word_len = 0;
     for (unsigned int i = 0; i < max_word_len; i++) {
-        if (current_word_ptr[i] == 0) {
+        if (WORD_CHAR(i) == 0) {
             word_len = i;
             break;
         }
     }
+#endif
     
     unsigned int out_len = 0;
     bool changed_flag = false;
     
     // Zero out the result buffer for this thread
-    for(unsigned int i = 0; i < max_output_len_padded; i++) {
-        result_ptr[i] = 0;
-    }
+    zero_output(result_ptr, max_output_len_padded);
 
     // --- Unify rule ID blocks ---
     unsigned int start_id_simple = 0;
@@ -70,12 +144,12 @@ __kernel void bfs_kernel(
     unsigned int end_id_INSERT EVERY = start_id_INSERT EVERY + 50; // vNX INSERT EVERY rules
 
     // --- SIMPLE RULES IMPLEMENTATION ---
-    if (rule_id >= start_id_simple && rule_id < end_id_simple) {
+    if (RULE_CLASS_ENABLED(RULE_CLASS_SIMPLE) && rule_id >= start_id_simple && rule_id < end_id_simple) {
         unsigned char cmd = rule_ptr[0];
         
         // Copy the word first
         for(unsigned int i = 0; i < word_len; i++) {
-            result_ptr[i] = current_word_ptr[i];
+            result_ptr[i] = WORD_CHAR(i);
         }
         out_len = word_len;
         
@@ -129,14 +203,14 @@ __kernel void bfs_kernel(
         }
         else if (cmd == 'r') { // Reverse
             for(unsigned int i = 0; i < word_len; i++) {
-                result_ptr[i] = current_word_ptr[word_len - 1 - i];
+                result_ptr[i] = WORD_CHAR(word_len - 1 - i);
             }
             changed_flag = true;
         }
         else if (cmd == 'k') { // Duplicate
             if (word_len * 2 <= max_output_len_padded) {
                 for(unsigned int i = 0; i < word_len; i++) {
-                    result_ptr[word_len + i] = current_word_ptr[i];
+                    result_ptr[word_len + i] = WORD_CHAR(i);
                 }
                 out_len = word_len * 2;
                 changed_flag = true;
@@ -146,11 +220,11 @@ __kernel void bfs_kernel(
             if (word_len * 2 <= max_output_len_padded) {
                 // Duplicate
                 for(unsigned int i = 0; i < word_len; i++) {
-                    result_ptr[word_len + i] = current_word_ptr[i];
+                    result_ptr[word_len + i] = WORD_CHAR(i);
                 }
                 // Reverse the duplicate
                 for(unsigned int i = 0; i < word_len; i++) {
-                    result_ptr[word_len + i] = current_word_ptr[word_len - 1 - i];
+                    result_ptr[word_len + i] = WORD_CHAR(word_len - 1 - i);
                 }
                 out_len = word_len * 2;
                 changed_flag = true;
@@ -159,8 +233,8 @@ __kernel void bfs_kernel(
         else if (cmd == 'd') { // Duplicate with space
             if (word_len * 2 + 1 <= max_output_len_padded) {
                 for(unsigned int i = 0; i < word_len; i++) {
-                    result_ptr[i] = current_word_ptr[i];
-                    result_ptr[word_len + 1 + i] = current_word_ptr[i];
+                    result_ptr[i] = WORD_CHAR(i);
+                    result_ptr[word_len + 1 + i] = WORD_CHAR(i);
                 }
                 result_ptr[word_len] = ' ';
                 out_len = word_len * 2 + 1;
@@ -171,13 +245,13 @@ __kernel void bfs_kernel(
             if (word_len * 2 + 1 <= max_output_len_padded) {
                 // Copy original
                 for(unsigned int i = 0; i < word_len; i++) {
-                    result_ptr[i] = current_word_ptr[i];
+                    result_ptr[i] = WORD_CHAR(i);
                 }
                 // Add space
                 result_ptr[word_len] = ' ';
                 // Add reversed
                 for(unsigned int i = 0; i < word_len; i++) {
-                    result_ptr[word_len + 1 + i] = current_word_ptr[word_len - 1 - i];
+                    result_ptr[word_len + 1 + i] = WORD_CHAR(word_len - 1 - i);
                 }
                 out_len = word_len * 2 + 1;
                 changed_flag = true;
@@ -185,12 +259,12 @@ __kernel void bfs_kernel(
         }
     }
     // --- T/D RULES IMPLEMENTATION ---
-    else if (rule_id >= start_id_TD && rule_id < end_id_TD) {
+    else if (RULE_CLASS_ENABLED(RULE_CLASS_TD) && rule_id >= start_id_TD && rule_id < end_id_TD) {
         unsigned char cmd = rule_ptr[0];
         
         // Copy the word first
         for(unsigned int i = 0; i < word_len; i++) {
-            result_ptr[i] = current_word_ptr[i];
+            result_ptr[i] = WORD_CHAR(i);
         }
         out_len = word_len;
         
@@ -219,7 +293,7 @@ __kernel void bfs_kernel(
         }
     }
     // --- S RULES IMPLEMENTATION ---
-    else if (rule_id >= start_id_s && rule_id < end_id_s) {
+    else if (RULE_CLASS_ENABLED(RULE_CLASS_S) && rule_id >= start_id_s && rule_id < end_id_s) {
         unsigned char cmd = rule_ptr[0];
         unsigned int rule_length = rule_len(rule_ptr, max_rule_len_padded);
         
@@ -229,8 +303,8 @@ __kernel void bfs_kernel(
             
             // Copy the word first
             for(unsigned int i = 0; i < word_len; i++) {
-                result_ptr[i] = current_word_ptr[i];
-                if (current_word_ptr[i] == find_char) {
+                result_ptr[i] = WORD_CHAR(i);
+                if (WORD_CHAR(i) == find_char) {
                     result_ptr[i] = replace_char;
                     changed_flag = true;
                 }
@@ -239,7 +313,7 @@ __kernel void bfs_kernel(
         }
     }
     // --- GROUP A RULES IMPLEMENTATION ---
-    else if (rule_id >= start_id_A && rule_id < end_id_A) {
+    else if (RULE_CLASS_ENABLED(RULE_CLASS_A) && rule_id >= start_id_A && rule_id < end_id_A) {
         unsigned char cmd = rule_ptr[0];
         
         if (cmd == '^') { // Prepend
@@ -247,7 +321,7 @@ __kernel void bfs_kernel(
             if (prepend_char != 0 && word_len + 1 < max_output_len_padded) {
                 result_ptr[0] = prepend_char;
                 for(unsigned int i = 0; i < word_len; i++) {
-                    result_ptr[i + 1] = current_word_ptr[i];
+                    result_ptr[i + 1] = WORD_CHAR(i);
                 }
                 out_len = word_len + 1;
                 changed_flag = true;
@@ -257,7 +331,7 @@ __kernel void bfs_kernel(
             unsigned char append_char = (rule_len(rule_ptr, max_rule_len_padded) > 1) ? rule_ptr[1] : 0;
             if (append_char != 0 && word_len + 1 < max_output_len_padded) {
                 for(unsigned int i = 0; i < word_len; i++) {
-                    result_ptr[i] = current_word_ptr[i];
+                    result_ptr[i] = WORD_CHAR(i);
                 }
                 result_ptr[word_len] = append_char;
                 out_len = word_len + 1;
@@ -269,8 +343,8 @@ __kernel void bfs_kernel(
             if (delete_char != 0) {
                 unsigned int out_idx = 0;
                 for(unsigned int i = 0; i < word_len; i++) {
-                    if (current_word_ptr[i] != delete_char) {
-                        result_ptr[out_idx++] = current_word_ptr[i];
+                    if (WORD_CHAR(i) != delete_char) {
+                        result_ptr[out_idx++] = WORD_CHAR(i);
                     } else {
                         changed_flag = true;
                     }
@@ -280,13 +354,13 @@ __kernel void bfs_kernel(
         }
     }
     // --- GROUP B RULES IMPLEMENTATION ---
-    else if (rule_id >= start_id_groupB && rule_id < end_id_groupB) {
+    else if (RULE_CLASS_ENABLED(RULE_CLASS_GROUP_B) && rule_id >= start_id_groupB && rule_id < end_id_groupB) {
         unsigned char cmd = rule_ptr[0];
         unsigned int N = (rule_len(rule_ptr, max_rule_len_padded) > 1) ? char_to_pos(rule_ptr[1]) : 0xFFFFFFFF;
         
         // Copy the word first
         for(unsigned int i = 0; i < word_len; i++) {
-            result_ptr[i] = current_word_ptr[i];
+            result_ptr[i] = WORD_CHAR(i);
         }
         out_len = word_len;
         
@@ -320,7 +394,7 @@ __kernel void bfs_kernel(
         else if (cmd == '[') { // Delete first character
             if (word_len > 1) {
                 for(unsigned int i = 0; i < word_len - 1; i++) {
-                    result_ptr[i] = current_word_ptr[i + 1];
+                    result_ptr[i] = WORD_CHAR(i + 1);
                 }
                 out_len = word_len - 1;
                 changed_flag = true;
@@ -337,7 +411,7 @@ __kernel void bfs_kernel(
             if (N != 0xFFFFFFFF && M != 0xFFFFFFFF && N <= M && M < word_len) {
                 unsigned int out_idx = 0;
                 for(unsigned int i = N; i <= M; i++) {
-                    result_ptr[out_idx++] = current_word_ptr[i];
+                    result_ptr[out_idx++] = WORD_CHAR(i);
                 }
                 out_len = out_idx;
                 changed_flag = true;
@@ -371,7 +445,7 @@ __kernel void bfs_kernel(
         }
         else if (cmd == '\'') { // Increment at position N
             if (N != 0xFFFFFFFF && N < word_len) {
-                result_ptr[N] = current_word_ptr[N] + 1;
+                result_ptr[N] = WORD_CHAR(N) + 1;
                 changed_flag = true;
             }
         }
@@ -381,14 +455,14 @@ __kernel void bfs_kernel(
                 for(int i = word_len; i > 0; i--) {
                     result_ptr[i] = result_ptr[i - 1];
                 }
-                result_ptr[0] = current_word_ptr[0];
+                result_ptr[0] = WORD_CHAR(0);
                 out_len = word_len + 1;
                 changed_flag = true;
             }
         }
         else if (cmd == 'Z') { // Duplicate last character
             if (word_len + 1 < max_output_len_padded) {
-                result_ptr[word_len] = current_word_ptr[word_len - 1];
+                result_ptr[word_len] = WORD_CHAR(word_len - 1);
                 out_len = word_len + 1;
                 changed_flag = true;
             }
@@ -397,8 +471,8 @@ __kernel void bfs_kernel(
             if (word_len * 2 < max_output_len_padded) {
                 unsigned int out_idx = 0;
                 for(unsigned int i = 0; i < word_len; i++) {
-                    result_ptr[out_idx++] = current_word_ptr[i];
-                    result_ptr[out_idx++] = current_word_ptr[i];
+                    result_ptr[out_idx++] = WORD_CHAR(i);
+                    result_ptr[out_idx++] = WORD_CHAR(i);
                 }
                 out_len = word_len * 2;
                 changed_flag = true;
@@ -406,10 +480,10 @@ __kernel void bfs_kernel(
         }
     }
     // --- NEW RULES IMPLEMENTATION ---
-    else if (rule_id >= start_id_new && rule_id < end_id_new) {
+    else if (RULE_CLASS_ENABLED(RULE_CLASS_NEW) && rule_id >= start_id_new && rule_id < end_id_new) {
         // Copy the word first
         for(unsigned int i = 0; i < word_len; i++) {
-            result_ptr[i] = current_word_ptr[i];
+            result_ptr[i] = WORD_CHAR(i);
         }
         out_len = word_len;
         
@@ -421,8 +495,8 @@ __kernel void bfs_kernel(
 
         if (cmd == 'K') { // 'K' (Swap last two characters)
             if (word_len >= 2) {
-                result_ptr[word_len - 1] = current_word_ptr[word_len - 2];
-                result_ptr[word_len - 2] = current_word_ptr[word_len - 1];
+                result_ptr[word_len - 1] = WORD_CHAR(word_len - 2);
+                result_ptr[word_len - 2] = WORD_CHAR(word_len - 1);
                 changed_flag = true;
             }
         }
@@ -436,37 +510,37 @@ __kernel void bfs_kernel(
         }
         else if (cmd == 'L') { // 'LN' (Bitwise shift left character @ N)
             if (N != 0xFFFFFFFF && N < word_len) {
-                result_ptr[N] = current_word_ptr[N] << 1;
+                result_ptr[N] = WORD_CHAR(N) << 1;
                 changed_flag = true;
             }
         }
         else if (cmd == 'R') { // 'RN' (Bitwise shift right character @ N)
             if (N != 0xFFFFFFFF && N < word_len) {
-                result_ptr[N] = current_word_ptr[N] >> 1;
+                result_ptr[N] = WORD_CHAR(N) >> 1;
                 changed_flag = true;
             }
         }
         else if (cmd == '+') { // '+N' (ASCII increment character @ N by 1)
             if (N != 0xFFFFFFFF && N < word_len) {
-                result_ptr[N] = current_word_ptr[N] + 1;
+                result_ptr[N] = WORD_CHAR(N) + 1;
                 changed_flag = true;
             }
         }
         else if (cmd == '-') { // '-N' (ASCII decrement character @ N by 1)
             if (N != 0xFFFFFFFF && N < word_len) {
-                result_ptr[N] = current_word_ptr[N] - 1;
+                result_ptr[N] = WORD_CHAR(N) - 1;
                 changed_flag = true;
             }
         }
         else if (cmd == '.') { // '.N' (Replace character @ N with value at @ N plus 1)
             if (N != 0xFFFFFFFF && N + 1 < word_len) {
-                result_ptr[N] = current_word_ptr[N + 1];
+                result_ptr[N] = WORD_CHAR(N + 1);
                 changed_flag = true;
             }
         }
         else if (cmd == ',') { // ',N' (Replace character @ N with value at @ N minus 1)
             if (N != 0xFFFFFFFF && N > 0 && N < word_len) {
-                result_ptr[N] = current_word_ptr[N - 1];
+                result_ptr[N] = WORD_CHAR(N - 1);
                 changed_flag = true;
             }
         }
@@ -480,7 +554,7 @@ __kernel void bfs_kernel(
                     }
                     // Duplicate first N characters at the beginning
                     for (unsigned int i = 0; i < N; i++) {
-                        result_ptr[i] = current_word_ptr[i];
+                        result_ptr[i] = WORD_CHAR(i);
                     }
                     out_len = total_len;
                     changed_flag = true;
@@ -493,7 +567,7 @@ __kernel void bfs_kernel(
                 if (total_len < max_output_len_padded) {
                     // Append last N characters
                     for (unsigned int i = 0; i < N; i++) {
-                        result_ptr[word_len + i] = current_word_ptr[word_len - N + i];
+                        result_ptr[word_len + i] = WORD_CHAR(word_len - N + i);
                     }
                     out_len = total_len;
                     changed_flag = true;
@@ -503,7 +577,7 @@ __kernel void bfs_kernel(
         else if (cmd == 'E') { // 'E' (Title case)
             // First lowercase everything
             for (unsigned int i = 0; i < word_len; i++) {
-                unsigned char c = current_word_ptr[i];
+                unsigned char c = WORD_CHAR(i);
                 if (c >= 'A' && c <= 'Z') {
                     result_ptr[i] = c + 32;
                 } else {
@@ -525,7 +599,7 @@ __kernel void bfs_kernel(
         else if (cmd == 'e') { // 'eX' (Title case with custom separator)
             // First lowercase everything
             for (unsigned int i = 0; i < word_len; i++) {
-                unsigned char c = current_word_ptr[i];
+                unsigned char c = WORD_CHAR(i);
                 if (c >= 'A' && c <= 'Z') {
                     result_ptr[i] = c + 32;
                 } else {
@@ -551,11 +625,11 @@ __kernel void bfs_kernel(
             
             if (target_count != 0xFFFFFFFF) {
                 for (unsigned int i = 0; i < word_len; i++) {
-                    if (current_word_ptr[i] == sep_char) {
+                    if (WORD_CHAR(i) == sep_char) {
                         separator_count++;
                         if (separator_count == target_count && i + 1 < word_len) {
                             // Toggle the case of the character after the separator
-                            unsigned char c = current_word_ptr[i + 1];
+                            unsigned char c = WORD_CHAR(i + 1);
                             if (c >= 'a' && c <= 'z') {
                                 result_ptr[i + 1] = c - 32;
                                 changed_flag = true;
@@ -571,7 +645,7 @@ __kernel void bfs_kernel(
         }
     }
     // --- INSERT EVERY RULES IMPLEMENTATION (vNX format) ---
-    else if (rule_id >= start_id_INSERT EVERY && rule_id < end_id_INSERT EVERY) {
+    else if (RULE_CLASS_ENABLED(RULE_CLASS_INSERT_EVERY) && rule_id >= start_id_INSERT EVERY && rule_id < end_id_INSERT EVERY) {
         unsigned char cmd = rule_ptr[0]; // Should be 'v'
         unsigned int rule_length = rule_len(rule_ptr, max_rule_len_padded);
         
@@ -601,7 +675,7 @@ __kernel void bfs_kernel(
                     if (N == 0) {
                         // Special case: N=0 means insert after every character
                         for (unsigned int i = 0; i < word_len; i++) {
-                            result_ptr[out_idx++] = current_word_ptr[i];
+                            result_ptr[out_idx++] = WORD_CHAR(i);
                             result_ptr[out_idx++] = X;
                         }
                         out_len = out_idx;
@@ -609,7 +683,7 @@ __kernel void bfs_kernel(
                     } else {
                         // Normal case: insert every N characters
                         for (unsigned int i = 0; i < word_len; i++) {
-                            result_ptr[out_idx++] = current_word_ptr[i];
+                            result_ptr[out_idx++] = WORD_CHAR(i);
                             char_counter++;
                             
                             // Insert character after every N bytes
@@ -632,7 +706,7 @@ __kernel void bfs_kernel(
                 unsigned int out_idx = 0;
                 
                 for (unsigned int i = 0; i < word_len; i++) {
-                    result_ptr[out_idx++] = current_word_ptr[i];
+                    result_ptr[out_idx++] = WORD_CHAR(i);
                     result_ptr[out_idx++] = X;
                 }
                 
@@ -649,9 +723,7 @@ __kernel void bfs_kernel(
         }
     } else {
         // If the word was not changed or rule execution failed/resulted in length 0, zero out the output
-        for (unsigned int i = 0; i < max_output_len_padded; i++) {
-            result_ptr[i] = 0;
-        }
+        zero_output(result_ptr, max_output_len_padded);
     }
 }
         
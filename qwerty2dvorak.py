@@ -2,6 +2,11 @@
 
 import sys
 import os
+import codecs
+from concurrent.futures import ThreadPoolExecutor
+
+# Input is read in 8 MiB chunks
+BUFFER_SIZE = 1 << 23
 
 # QWERTY to Russian Dvorak keymap (simplified example)
 qwerty_to_dvorak_russian = {
@@ -13,33 +18,61 @@ qwerty_to_dvorak_russian = {
     'Z': 'Ð¯', 'X': 'Ð§', 'C': 'Ð¡', 'V': 'Ðœ', 'B': 'Ð˜', 'N': 'Ð¢', 'M': 'Ð¬'
 }
 
-def translate_to_dvorak(line):
-    return ''.join(qwerty_to_dvorak_russian.get(char, char) for char in line)
+# The keymap as a str.translate table, so a whole chunk is translated in one C-level pass
+DVORAK_TABLE = str.maketrans(qwerty_to_dvorak_russian)
+
+def translate_to_dvorak(text):
+    return text.translate(DVORAK_TABLE)
 
 def convert_file(input_path, output_path, encoding='utf-8', errors='ignore'):
     # Use buffered reading for large file support
     total_bytes = os.path.getsize(input_path)
     bytes_read = 0
-    buffer_size = 1024 * 1024  # 1MB chunks
+    # An incremental decoder holds back a character split across two chunks
+    # instead of dropping or mangling it
+    decoder = codecs.getincrementaldecoder(encoding)(errors=errors)
+
+    # Chunks are encoded here and written by a single writer thread, so the
+    # write of one chunk overlaps with reading and translating the next
+    with open(input_path, 'rb', buffering=0) as infile, open(output_path, 'wb') as outfile, \
+            ThreadPoolExecutor(max_workers=1) as writer:
+        pending = None
 
-    with open(input_path, 'rb') as infile, open(output_path, 'w', encoding='utf-8') as outfile:
-        while chunk := infile.read(buffer_size):
+        def write(text):
+            nonlocal pending
+            data = translate_to_dvorak(text).encode('utf-8')
+            # Wait for the previous write, so at most one chunk is in flight
+            # and write errors are raised here
+            if pending is not None:
+                pending.result()
+            pending = writer.submit(outfile.write, data)
+
+        while chunk := infile.read(BUFFER_SIZE):
             try:
-                decoded = chunk.decode(encoding, errors=errors)
+                decoded = decoder.decode(chunk)
             except Exception as e:
                 print(f"Decoding error: {e}")
+                decoder.reset()
                 continue
 
-            # Translate and write
-            lines = decoded.splitlines(keepends=True)
-            for line in lines:
-                translated = translate_to_dvorak(line)
-                outfile.write(translated)
+            # Translate and write the whole chunk; translation keeps line breaks as they are
+            write(decoded)
 
             bytes_read += len(chunk)
             percent = bytes_read / total_bytes * 100
             print(f"Progress: {percent:.2f}%", end='\r', flush=True)
 
+        # Flush a character left incomplete at the end of the file
+        try:
+            tail = decoder.decode(b'', final=True)
+        except Exception as e:
+            print(f"Decoding error: {e}")
+            tail = ''
+        # Outside the try, so a write error is not reported as a decoding error
+        write(tail)
+
+        pending.result()
+
     print("\nConversion complete.")
 
 def main():